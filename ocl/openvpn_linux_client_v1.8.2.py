@@ -19,24 +19,25 @@ __license__ = "GPL 3"
 
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from PIL import Image, ImageTk
 import threading
-import pexpect
-import psutil
 import time
 import re
 import os
-import netifaces
 import sys
-import queue
 import json
-import keyring
 from pathlib import Path
-from screeninfo import get_monitors
 import platform
-
-# ---- Imports for Encryption and Keyring ----
-from cryptography.fernet import Fernet
+import functools
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from types import MappingProxyType
+# orjson is optional: when installed it is used to (de)serialize config.json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+# PIL, pexpect, psutil, screeninfo, netifaces, keyring and cryptography are
+# imported where they are first needed, so their import cost isn't paid
+# before the splash appears.
  
 
 # ---------------------------------------------------------------------
@@ -47,6 +48,9 @@ def get_or_create_key() -> bytes:
     Retrieve the Fernet key from the OS keyring, or generate a new one
     if it doesn't exist yet.
     """
+    import keyring
+    from cryptography.fernet import Fernet
+
     service_name = "openvpn_app"
     key_name = "my_encryption_key"
 
@@ -61,19 +65,23 @@ def get_or_create_key() -> bytes:
         # Convert the stored string back to bytes
         return found_key.encode('utf-8')
 
-# Get the key at startup
-STORED_KEY = get_or_create_key()
+@functools.lru_cache(maxsize=1)
+def get_fernet():
+    """
+    One Fernet for the process, built on first use. The keyring is only
+    contacted once credentials are actually encrypted or decrypted.
+    """
+    from cryptography.fernet import Fernet
+    return Fernet(get_or_create_key())
 
 def encrypt_string(plaintext: str) -> str:
     """Encrypts a string using Fernet from OS keyring and returns base64-encoded."""
-    f = Fernet(STORED_KEY)
-    token = f.encrypt(plaintext.encode('utf-8'))  # bytes
+    token = get_fernet().encrypt(plaintext.encode('utf-8'))  # bytes
     return token.decode('utf-8')  # convert bytes -> str
 
 def decrypt_string(ciphertext: str) -> str:
     """Decrypts a base64-encoded Fernet token (from OS keyring) and returns the plaintext."""
-    f = Fernet(STORED_KEY)
-    plaintext = f.decrypt(ciphertext.encode('utf-8'))  # bytes
+    plaintext = get_fernet().decrypt(ciphertext.encode('utf-8'))  # bytes
     return plaintext.decode('utf-8')
 
 # ---------------------------------------------------------------------
@@ -94,78 +102,323 @@ else:
 
 BUNDLED_OPENVPN_PATH = os.path.join(BASE_DIR, "bin", OPENVPN_BINARY_NAME)
 
+# ioctl request for an interface's IPv4 address (linux/sockios.h)
+SIOCGIFADDR = 0x8915
+
+# Per-connection settings for driving the OpenVPN process. The session runs
+# in bytes mode: nothing is decoded, and str sent to it is UTF-8 encoded.
+AUTH_PROMPT_TIMEOUT = 60   # seconds to wait for the username/password prompts
+MFA_PROMPT_TIMEOUT = 30    # seconds to wait for a possible 2FA challenge
+MFA_CODE_TIMEOUT = 300     # seconds the user gets to enter the 2FA code
+CONNECT_TIMEOUT = 120      # seconds to wait for the connection result after auth
+STOP_TIMEOUT = 10          # seconds OpenVPN gets to exit on SIGTERM before SIGKILL
+
+# Bytes pexpect reads from OpenVPN per read() call
+PEXPECT_MAXREAD = 4096
+# Only the tail of pexpect's buffer is searched for prompts/markers, instead of
+# rescanning everything OpenVPN printed so far on every read. pexpect cuts each
+# read down to this window before searching, so it must hold a full read plus
+# a marker split across two reads.
+PEXPECT_SEARCH_WINDOW = PEXPECT_MAXREAD + 256
+
+# The pexpect session log (everything OpenVPN prints; what we send is not
+# logged) is only written when debugging: start with --debug or OCL_DEBUG=1.
+OPENVPN_DEBUG_LOG = (
+    "pexpect_log.txt"
+    if "--debug" in sys.argv or os.environ.get("OCL_DEBUG") == "1"
+    else None
+)
+
+# OpenVPN prompts, compiled once instead of on every connect (bytes, to
+# match the raw session output)
+USERNAME_PROMPT_RE = re.compile(rb"Enter Auth Username.*:", re.IGNORECASE)
+PASSWORD_PROMPT_RE = re.compile(rb"Enter Auth Password.*:", re.IGNORECASE)
+MFA_CHALLENGE_RE = re.compile(rb"CHALLENGE:", re.IGNORECASE)
+# Plain markers, matched with expect_exact() (bytes.find, no regex engine)
+AUTH_FAILED_MARKER = b"AUTH_FAILED"
+CONNECTED_MARKER = b"Initialization Sequence Completed"
+# The same markers for the 2FA challenge wait, which also needs a regex
+AUTH_FAILED_RE = re.compile(re.escape(AUTH_FAILED_MARKER))
+CONNECTED_RE = re.compile(re.escape(CONNECTED_MARKER))
+
+# config.json (de)serializers working on bytes; orjson.JSONDecodeError
+# subclasses json.JSONDecodeError, so callers only need to catch the latter
+if orjson is not None:
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+else:
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
 CONFIG_DIR = Path.home() / ".openvpn_client"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 
+# Parsed config, kept in memory after the first load, the config.json
+# mtime it corresponds to, and a flag telling whether it was mutated since
+# it was last written to disk.
+_config_cache = None
+_config_mtime = None
+_config_dirty = False
+# Plain-text signature of what save_config() last wrote, see config_signature()
+_config_saved_signature = None
+
+def mark_config_dirty():
+    """Flag the in-memory config as changed so the next save writes it."""
+    global _config_dirty
+    _config_dirty = True
+
+def config_is_dirty():
+    return _config_dirty
+
+def get_config_mtime():
+    """mtime of config.json in ns, or None if it doesn't exist."""
+    try:
+        return CONFIG_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def config_signature(config_data):
+    """The values save_config() would persist for `config_data`, before encryption."""
+    remember = config_data.get("remember_credentials", False)
+    return (
+        config_data.get("show_splash", True),
+        config_data.get("theme", "dark"),
+        remember,
+        config_data.get("saved_username", "") if remember else "",
+        config_data.get("saved_password", "") if remember else "",
+    )
+
 def load_config():
     """
     Load the config.json file and decrypt saved credentials if present.
     Returns a dict with settings (in plain text).
+    The parsed dict is cached; later calls only re-read the file if it was
+    changed on disk in the meantime.
     """
-    if CONFIG_FILE.exists():
+    global _config_cache, _config_mtime, _config_saved_signature
+    mtime = get_config_mtime()
+    if _config_cache is not None and mtime == _config_mtime:
+        return _config_cache
+
+    # Whether the file holds exactly what was loaded (so saving the same
+    # values again can be skipped)
+    matches_file = True
+    try:
+        data = json_loads(CONFIG_FILE.read_bytes())
+    except (FileNotFoundError, json.JSONDecodeError):
+        # If the file doesn't exist or is invalid, fallback to defaults
+        data = {}
+        matches_file = False
+
+    # Provide defaults if keys are missing
+    data.setdefault("show_splash", True)
+    data.setdefault("theme", "dark")
+    data.setdefault("remember_credentials", False)
+    data.setdefault("saved_username", "")
+    data.setdefault("saved_password", "")
+
+    # Decrypt credentials if they're not empty
+    if data["saved_username"]:
         try:
-            with open(CONFIG_FILE, "r") as f:
-                data = json.load(f)
-        except json.JSONDecodeError:
-            # If the JSON file is invalid, fallback to defaults
-            data = {}
-
-        # Provide defaults if keys are missing
-        data.setdefault("show_splash", True)
-        data.setdefault("theme", "dark")
-        data.setdefault("remember_credentials", False)
-        data.setdefault("saved_username", "")
-        data.setdefault("saved_password", "")
-
-        # Decrypt credentials if they're not empty
-        if data["saved_username"]:
-            try:
-                data["saved_username"] = decrypt_string(data["saved_username"])
-            except Exception:
-                data["saved_username"] = ""
+            data["saved_username"] = decrypt_string(data["saved_username"])
+        except Exception:
+            data["saved_username"] = ""
+            matches_file = False
 
-        if data["saved_password"]:
-            try:
-                data["saved_password"] = decrypt_string(data["saved_password"])
-            except Exception:
-                data["saved_password"] = ""
+    if data["saved_password"]:
+        try:
+            data["saved_password"] = decrypt_string(data["saved_password"])
+        except Exception:
+            data["saved_password"] = ""
+            matches_file = False
 
-        return data
-    else:
-        # If file doesn’t exist, return our default structure
-        return {
-            "show_splash": True,
-            "theme": "dark",
-            "remember_credentials": False,
-            "saved_username": "",
-            "saved_password": ""
-        }
+    _config_cache = data
+    _config_mtime = mtime
+    _config_saved_signature = config_signature(data) if matches_file else None
+    return data
 
 def save_config(config_data):
     """
     Save the config data to config.json, encrypting credentials only in a copy.
     This avoids storing the encrypted strings in memory, preventing double-encryption.
+    Nothing is encrypted or written if the same values were already saved and
+    the file wasn't touched since (e.g. reconnecting with the same credentials).
     """
+    global _config_cache, _config_mtime, _config_dirty, _config_saved_signature
+    signature = config_signature(config_data)
+    if signature == _config_saved_signature and get_config_mtime() == _config_mtime:
+        _config_cache = config_data
+        _config_dirty = False
+        return
+
     data_to_save = {
         "show_splash": config_data.get("show_splash", True),
         "theme": config_data.get("theme", "dark"),
         "remember_credentials": config_data.get("remember_credentials", False),
     }
 
-    if data_to_save["remember_credentials"]:
-        data_to_save["saved_username"] = encrypt_string(config_data.get("saved_username", ""))
-        data_to_save["saved_password"] = encrypt_string(config_data.get("saved_password", ""))
-    else:
-        data_to_save["saved_username"] = ""
-        data_to_save["saved_password"] = ""
-
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(data_to_save, f, indent=4)
-
+    # Fernet is only used for non-empty credentials that should be remembered;
+    # empty values are stored as "" (load_config() doesn't decrypt those)
+    remember = data_to_save["remember_credentials"]
+    for key in ("saved_username", "saved_password"):
+        value = config_data.get(key, "") if remember else ""
+        data_to_save[key] = encrypt_string(value) if value else ""
+
+    # Encode up front so the file is written with a single write()
+    payload = json_dumps(data_to_save)
+    try:
+        f = open(CONFIG_FILE, "wb")
+    except FileNotFoundError:
+        # Only the first save (or one after the directory was removed) needs this
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        f = open(CONFIG_FILE, "wb")
+    with f:
+        f.write(payload)
+
+    _config_cache = config_data
+    _config_mtime = get_config_mtime()
+    _config_dirty = False
+    _config_saved_signature = signature
+
+@functools.lru_cache(maxsize=None)
 def get_asset_path(filename):
     return os.path.join(BASE_DIR, "images", filename)
 
+def get_sized_asset_path(path, size):
+    """Path of the pre-resized copy of an asset, e.g. images/on3_70x70.png."""
+    stem = os.path.splitext(path)[0]
+    return f"{stem}_{size[0]}x{size[1]}.png"
+
+def open_image(path):
+    """
+    Open and decode an image as RGBA, or as RGB when it has no alpha to
+    keep (e.g. the backgrounds), which saves a channel in memory and in the
+    LANCZOS pass. RGB/RGBA files are used as-is, without a converting copy.
+    """
+    from PIL import Image
+    image = Image.open(path)
+    if image.mode in ("RGB", "RGBA"):
+        image.load()
+        return image
+    if "A" in image.getbands() or "transparency" in image.info:
+        return image.convert("RGBA")
+    return image.convert("RGB")
+
+@functools.lru_cache(maxsize=None)
+def load_image(path, size):
+    """
+    Open an image (see open_image) and LANCZOS-resize it to `size`.
+    If a pre-resized copy ships next to it (see get_sized_asset_path), that
+    one is used as-is, and an image that already has the target size is
+    not resampled either.
+    Pure PIL work, so it is safe to run from worker threads.
+    """
+    from PIL import Image
+    sized_path = get_sized_asset_path(path, size)
+    if os.path.exists(sized_path):
+        path = sized_path
+    image = open_image(path)
+    if image.size == tuple(size):
+        return image
+    # reducing_gap lets PIL do a cheap integer reduce() before the LANCZOS pass
+    return image.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+@functools.lru_cache(maxsize=None)
+def load_photo(path, size):
+    """
+    Return a Tk PhotoImage for `path` resized to `size` (main thread only).
+    Results are memoized per (path, size), so an asset used in several
+    places (e.g. the same button in both themes) is only decoded once.
+    A pre-resized copy is handed straight to Tk's own PNG reader, skipping
+    the PIL decode and the copy into the PhotoImage.
+    """
+    sized_path = get_sized_asset_path(path, size)
+    if os.path.exists(sized_path):
+        return tk.PhotoImage(file=sized_path)
+    from PIL import ImageTk
+    return ImageTk.PhotoImage(load_image(path, size))
+
+def preload_images(assets, max_workers=4):
+    """
+    Start decoding and resizing (filename, size) assets in parallel in the
+    background; PIL releases the GIL while decoding/resampling.
+    Returns the futures, so callers can wait for them when they need them.
+    Assets with a pre-resized copy are skipped: load_photo() lets Tk read
+    those directly, so there is nothing for PIL to prepare.
+    """
+    paths = [
+        (get_asset_path(name), size) for name, size in assets
+        if not os.path.exists(get_sized_asset_path(get_asset_path(name), size))
+    ]
+    if not paths:
+        return []
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    futures = [pool.submit(load_image, path, size) for path, size in paths]
+    pool.shutdown(wait=False)
+    return futures
+
+# Main window images that depend on the theme:
+# theme name -> role -> (file in images/, size)
+THEME_IMAGES = {
+    "dark": {
+        "bg": ("background_dark.png", (330, 650)),
+        "logo": ("openvpnlogo.png", (290, 72)),
+        "toggle_icon": ("light_mode_icon.png", (30, 30)),
+        "connect": ("on3.png", (70, 70)),
+        "disconnect": ("off3.png", (70, 70)),
+    },
+    "light": {
+        "bg": ("background_light.png", (330, 650)),
+        "logo": ("openvpnlogo.png", (290, 72)),
+        "toggle_icon": ("dark_mode_icon.png", (30, 30)),
+        "connect": ("on3.png", (70, 70)),
+        "disconnect": ("off3.png", (70, 70)),
+    },
+}
+
+# Theme-independent main window images: attribute name -> (file in images/, size)
+COMMON_IMAGES = {
+    "cover_network_image": ("cover_network.png", (330, 160)),
+}
+
+# Shown instead of the config path while none is selected (display only)
+NO_CONFIG_SELECTED = "None. Choose a ovpn file, Menu -> Choose ovpn file"
+
+# Main window canvas texts, created in this order by create_widgets():
+# (attribute or None, x, y, text, font, fill, anchor, width)
+# A fill without "#" is a key into the current theme; "fg" items are tagged "themed_fg".
+CANVAS_TEXT_ITEMS = (
+    (None, 30, 140, "Current OpenVPN config file:", ("Arial", 10), "fg", "nw", 0),
+    ("config_text_item", 30, 156, NO_CONFIG_SELECTED, ("Arial", 9), "filetext", "nw", 240),
+    (None, 30, 210, "\U0001F464 Username:", ("Arial", 12), "fg", "nw", 0),
+    (None, 30, 280, "\U0001F512 Password:", ("Arial", 12), "fg", "nw", 0),
+    (None, 165, 465, "📶 Network Traffic", ("Arial", 12, "bold"), "#8ec4e9", "center", 0),
+    ("sent_label_item", 100, 487, "📤 Sent: 0.00 MB", ("Arial", 9), "fg", "center", 0),
+    ("received_label_item", 230, 487, "📥 Received: 0.00 MB", ("Arial", 9), "fg", "center", 0),
+    ("vpnip_label_item", 165, 502, "", ("Arial", 10, "bold"), "#FEEC14", "center", 0),
+    (None, 165, 532, "VPN STATUS:", ("Arial", 10), "fg", "center", 0),
+    ("status_text_item", 165, 550, " \U0001F513 Not Connected ", ("Arial", 12, "bold"), "#fe7014", "center", 0),
+)
+
+# Main window widgets placed on the canvas by create_widgets() once they are
+# built, all anchored "nw": (attribute, x, y)
+CANVAS_WINDOWS = (
+    ("toggle_button_theme", 285, 110),
+    ("username_entry", 30, 230),
+    ("password_entry", 30, 300),
+    ("show_password_check", 155, 280),
+    ("remember_me_checkbox", 30, 338),
+    ("toggle_button_connect", 128, 368),
+)
+
+# Status line (text, fill) shown by the theme refresh, indexed by self.connected
+CONNECTION_STATUS = (
+    (" \U0001F513 Not Connected ", "orange"),
+    (" \U0001F512 Connected ", "#71e900"),
+)
+
 light_theme = {
     "bg": "#6999bf",
     "fg": "#000000",
@@ -175,7 +428,7 @@ light_theme = {
     "highlight": "#444444",
     "button_bg": "#e0e0e0",
     "button_fg": "#000000",
-    "ht": "2",
+    "ht": 2,
     "hb": "orange",
     "bg_but": "orange",
     "highlight_text": "#000000",
@@ -191,16 +444,48 @@ dark_theme = {
     "highlight": "#44e602",
     "button_bg": "#3a3b3c",
     "button_fg": "#ffffff",
-    "ht": "2",
+    "ht": 2,
     "hb": "#fe7014",
     "bg_but": "orange",
     "highlight_text": "#44e602",
     "filetext": "#fe7014"
 }
 
+# ---------------------------------------------------------------------
+# OPENVPN LOG
+# ---------------------------------------------------------------------
+class PexpectLog:
+    """
+    Buffered logfile for pexpect. pexpect calls flush() after every chunk it
+    logs, which would turn any file buffer into one write() per read, so
+    flush() is a no-op here: data is written when the buffer fills or on close().
+    """
+    def __init__(self, path, buffer_size=65536):
+        self.file = open(path, "wb", buffering=buffer_size)
+
+    def write(self, data):
+        self.file.write(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.file.close()
+
 # ---------------------------------------------------------------------
 # SPLASH SCREEN
 # ---------------------------------------------------------------------
+@functools.lru_cache(maxsize=1)
+def get_monitors_cached():
+    """Query the display server for monitors once; call cache_clear() to re-query."""
+    from screeninfo import get_monitors
+    return tuple(get_monitors() or ())
+
+def get_primary_monitor():
+    """Return the primary monitor (or None)."""
+    monitors = get_monitors_cached()
+    return monitors[0] if monitors else None
+
 class SplashScreen(tk.Toplevel):
     def __init__(self, parent, image_path, message, duration=2500, config=None):
         super().__init__(parent)
@@ -209,11 +494,14 @@ class SplashScreen(tk.Toplevel):
         self.overrideredirect(True)
 
         try:
-            splash_image = (
-                Image.open(image_path)
-                .convert("RGBA")
-                .resize((550, 324), Image.Resampling.LANCZOS)
-            )
+            from PIL import Image, ImageTk
+            splash_image = Image.open(image_path)
+            # For JPEGs, let libjpeg decode straight at a reduced scale when the
+            # source is at least twice the splash size (no-op otherwise)
+            splash_image.draft("RGB", (550, 324))
+            if splash_image.mode not in ("RGB", "RGBA"):
+                splash_image = splash_image.convert("RGBA")
+            splash_image = splash_image.resize((550, 324), Image.Resampling.LANCZOS, reducing_gap=3.0)
             self.splash_photo = ImageTk.PhotoImage(splash_image)
         except Exception as e:
             messagebox.showerror("Splash Image Error", f"Failed to load splash image: {e}")
@@ -244,64 +532,130 @@ class SplashScreen(tk.Toplevel):
         )
         self.checkbox_window = self.canvas.create_window(75, 300, window=self.checkbox, anchor="center")
 
+        # The app closes the splash after `duration` ms (see on_splash_close)
         self.center_on_primary_monitor(531, 315)
-        self.after(self.duration, self.destroy)
 
     def center_on_primary_monitor(self, width, height):
-        monitors = get_monitors()
-        if not monitors:
+        primary_monitor = get_primary_monitor()
+        if primary_monitor is None:
             x, y = 100, 100
         else:
-            primary_monitor = monitors[0]
             x = primary_monitor.x + (primary_monitor.width - width) // 2
             y = primary_monitor.y + (primary_monitor.height - height) // 2
         self.geometry(f"{width}x{height}+{x}+{y}")
 
     def on_checkbox_toggle(self):
         self.config_data["show_splash"] = not self.dont_show_var.get()
+        mark_config_dirty()
 
 # ---------------------------------------------------------------------
 # TRAFFIC MONITOR
 # ---------------------------------------------------------------------
+BYTES_TO_MB = 1.0 / (1024 * 1024)
+
+# Last (time.monotonic(), (bytes_sent, bytes_recv)) reading, see get_net_io_counters()
+_net_io_cache = (0.0, None)
+
+# /proc/net/dev stays open between samples; each read just seeks back to 0
+_proc_net_dev = None
+
+def read_proc_net_dev():
+    """(bytes_sent, bytes_recv) summed over all interfaces except loopback."""
+    global _proc_net_dev
+    if _proc_net_dev is None:
+        _proc_net_dev = open("/proc/net/dev", "rb", buffering=0)
+    _proc_net_dev.seek(0)
+    sent = recv = 0
+    # Two header lines, then "iface: rx_bytes rx_packets ... tx_bytes ..."
+    for line in _proc_net_dev.read().splitlines()[2:]:
+        iface, _, fields = line.partition(b":")
+        if iface.strip() == b"lo":
+            continue
+        fields = fields.split()
+        recv += int(fields[0])
+        sent += int(fields[8])
+    return sent, recv
+
+def get_net_io_counters(max_age=0.5):
+    """
+    System-wide (bytes_sent, bytes_recv), reusing the previous reading when
+    it is younger than `max_age` seconds so several callers share one read.
+    Linux reads /proc/net/dev directly; other platforms go through psutil.
+    """
+    global _net_io_cache
+    now = time.monotonic()
+    timestamp, counters = _net_io_cache
+    if counters is None or now - timestamp >= max_age:
+        if sys.platform.startswith("linux"):
+            counters = read_proc_net_dev()
+        else:
+            import psutil
+            stats = psutil.net_io_counters(pernic=False, nowrap=True)
+            counters = (stats.bytes_sent, stats.bytes_recv)
+        _net_io_cache = (now, counters)
+    return counters
+
 class TrafficMonitor:
-    def __init__(self, root, canvas, sent_label_item, received_label_item, theme):
+    """
+    Shows the traffic since connecting. Sampling runs on the Tk event loop
+    via root.after(), so there is no background thread to wake or stop.
+    """
+    def __init__(self, root, canvas, sent_label_item, received_label_item, theme, poll_interval=2.0):
         self.root = root
         self.canvas = canvas
         self.sent_label_item = sent_label_item
         self.received_label_item = received_label_item
         self.theme = theme
-        self.monitoring = True
+        self.poll_interval = poll_interval
+        self.monitoring = False
+        self.after_id = None
         self.initial_sent = 0
         self.initial_recv = 0
+        self.last_sent = None
+        self.last_recv = None
 
     def monitor_traffic(self):
+        """One sample; reschedules itself while monitoring."""
+        self.after_id = None
         try:
-            initial = psutil.net_io_counters()
-            self.initial_sent = initial.bytes_sent
-            self.initial_recv = initial.bytes_recv
-
-            while self.monitoring:
-                stats = psutil.net_io_counters()
-                total_sent = (stats.bytes_sent - self.initial_sent) / (1024 * 1024)
-                total_recv = (stats.bytes_recv - self.initial_recv) / (1024 * 1024)
-
-                self.root.after(0, self.update_labels, total_sent, total_recv)
-                time.sleep(1)
+            bytes_sent, bytes_recv = get_net_io_counters()
         except Exception as e:
             print(f"Traffic Monitor Error: {e}")
             self.monitoring = False
+            return
+
+        # Rounded to the 2 decimals shown, so the canvas is only touched
+        # when the displayed value changes
+        total_sent = round((bytes_sent - self.initial_sent) * BYTES_TO_MB, 2)
+        total_recv = round((bytes_recv - self.initial_recv) * BYTES_TO_MB, 2)
+
+        if total_sent != self.last_sent or total_recv != self.last_recv:
+            self.last_sent, self.last_recv = total_sent, total_recv
+            self.update_labels(total_sent, total_recv)
+
+        if self.monitoring:
+            self.after_id = self.root.after(int(self.poll_interval * 1000), self.monitor_traffic)
 
     def update_labels(self, total_sent, total_recv):
         self.canvas.itemconfig(self.sent_label_item, text=f"📤 Sent: {total_sent:.2f} MB")
         self.canvas.itemconfig(self.received_label_item, text=f"📥 Received: {total_recv:.2f} MB")
 
     def start_monitoring(self):
+        self.stop_monitoring()
+        try:
+            self.initial_sent, self.initial_recv = get_net_io_counters()
+        except Exception as e:
+            print(f"Traffic Monitor Error: {e}")
+            return
+        self.last_sent = self.last_recv = None
         self.monitoring = True
-        monitor_thread = threading.Thread(target=self.monitor_traffic, daemon=True)
-        monitor_thread.start()
+        self.monitor_traffic()
 
     def stop_monitoring(self):
         self.monitoring = False
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
 
 # ---------------------------------------------------------------------
 # MAIN APPLICATION
@@ -313,75 +667,124 @@ class OpenVPNClientApp:
 
         self.config = load_config()
         saved_theme = self.config.get("theme", "dark")
-        self.current_theme = dark_theme if saved_theme == "dark" else light_theme
+        self.apply_theme(dark_theme if saved_theme == "dark" else light_theme)
 
         self.vpn_process = None
-        self.monitoring = False
-        self.mfa_code = None
+        self.vpn_log = None
+        # Resolved with the 2FA code by the MFA popup, awaited by run_vpn
+        self.mfa_future = None
         self.connected = False
-        self.queue = queue.Queue()
+        self.theme_images = {}
+        self.connection_views = {}
+        self.button_colors = {}
+        self.theme_snapshots = {}
+        self.config_save_id = None
 
         # We'll store the VPN IP string here, initially blank
         self.VPNIP = ""
 
-        # Load images
-        try:
-            self.dark_mode_img = ImageTk.PhotoImage(
-                Image.open(get_asset_path("light_mode_icon.png")).convert("RGBA")
-                .resize((30, 30), Image.Resampling.LANCZOS)
-            )
-            self.light_mode_img = ImageTk.PhotoImage(
-                Image.open(get_asset_path("dark_mode_icon.png")).convert("RGBA")
-                .resize((30, 30), Image.Resampling.LANCZOS)
-            )
-
-            self.connect_button_image_dark = ImageTk.PhotoImage(
-                Image.open(get_asset_path("on3.png")).convert("RGBA")
-                .resize((70, 70), Image.Resampling.LANCZOS)
-            )
-            self.disconnect_button_image_dark = ImageTk.PhotoImage(
-                Image.open(get_asset_path("off3.png")).convert("RGBA")
-                .resize((70, 70), Image.Resampling.LANCZOS)
-            )
-
-            self.connect_button_image_light = ImageTk.PhotoImage(
-                Image.open(get_asset_path("on3.png")).convert("RGBA")
-                .resize((70, 70), Image.Resampling.LANCZOS)
-            )
-            self.disconnect_button_image_light = ImageTk.PhotoImage(
-                Image.open(get_asset_path("off3.png")).convert("RGBA")
-                .resize((70, 70), Image.Resampling.LANCZOS)
-            )
-
-            self.cover_network_image = ImageTk.PhotoImage(
-                Image.open(get_asset_path("cover_network.png")).convert("RGBA")
-                .resize((330, 160), Image.Resampling.LANCZOS)
-            )
-
-            self.logo_dark = ImageTk.PhotoImage(
-                Image.open(get_asset_path("openvpnlogo.png")).convert("RGBA")
-                .resize((290, 72), Image.Resampling.LANCZOS)
-            )
-            self.logo_light = self.logo_dark
+        # Splash disabled: no splash window, image or timer at all
+        if not self.config.get("show_splash", True):
+            self.image_futures = preload_images(self.startup_images())
+            self.initialize_main_window()
+            return
 
-            self.bg_image_dark = ImageTk.PhotoImage(
-                Image.open(get_asset_path("background_dark.png")).convert("RGBA")
-                .resize((330, 650), Image.Resampling.LANCZOS)
+        # Main window images are decoded in the background while the splash is
+        # shown; initialize_main_window() waits for them.
+        self.show_splash_screen()
+        self.image_futures = preload_images(self.startup_images())
+
+    def get_theme_name(self):
+        return "dark" if self.is_dark else "light"
+
+    def startup_images(self):
+        """(file, size) pairs needed to show the main window in the saved theme."""
+        return set(THEME_IMAGES[self.get_theme_name()].values()) | set(COMMON_IMAGES.values())
+
+    def get_theme_images(self):
+        """
+        PhotoImages of the current theme, keyed by role. The other theme's
+        images are only decoded the first time the user switches to it.
+        They stay referenced here for the app's lifetime, so widgets showing
+        them don't need their own `.image` keep-alive attribute.
+        """
+        name = self.get_theme_name()
+        images = self.theme_images.get(name)
+        if images is None:
+            images = {
+                role: load_photo(get_asset_path(filename), size)
+                for role, (filename, size) in THEME_IMAGES[name].items()
+            }
+            self.theme_images[name] = images
+        return images
+
+    def get_connection_view(self):
+        """
+        (connect button image, status text, status fill) for the current
+        theme and connection state. The 2x2 table is filled on first use, so
+        the other theme's images are only decoded once it is shown.
+        """
+        key = (self.is_dark, self.connected)
+        view = self.connection_views.get(key)
+        if view is None:
+            image = self.get_theme_images()["disconnect" if self.connected else "connect"]
+            view = (image,) + CONNECTION_STATUS[self.connected]
+            self.connection_views[key] = view
+        return view
+
+    def get_button_colors(self):
+        """Read-only bg/fg/active* options for the image buttons in the current theme."""
+        colors = self.button_colors.get(self.is_dark)
+        if colors is None:
+            theme = self.current_theme
+            colors = MappingProxyType({
+                "bg": theme["bg"],
+                "fg": theme["fg"],
+                "activebackground": theme["bg"],
+                "activeforeground": theme["fg"],
+            })
+            self.button_colors[self.is_dark] = colors
+        return colors
+
+    def get_theme_snapshot(self):
+        """
+        What apply_theme_to_widgets() sets for the current theme, resolved
+        once per theme: ((widget, options), ...), ((canvas item, options), ...)
+        and the entry (bg, fg) colors. Needs the main window widgets.
+        """
+        snapshot = self.theme_snapshots.get(self.is_dark)
+        if snapshot is None:
+            assets = self.get_theme_images()
+            theme = self.current_theme
+            widget_options = (
+                (self.toggle_button_theme, {"image": assets["toggle_icon"], **self.get_button_colors()}),
             )
-            self.bg_image_light = ImageTk.PhotoImage(
-                Image.open(get_asset_path("background_light.png")).convert("RGBA")
-                .resize((330, 650), Image.Resampling.LANCZOS)
+            item_options = (
+                (self.bg_item, {"image": assets["bg"]}),
+                (self.logo_item, {"image": assets["logo"]}),
+                (self.config_text_item, {"fill": theme["filetext"]}),
+                # Labels and traffic counters drawn in the theme's fg share one tag
+                ("themed_fg", {"fill": theme["fg"]}),
             )
+            entry_colors = (theme["bg_input"], theme["fg_input"])
+            snapshot = (widget_options, item_options, entry_colors)
+            self.theme_snapshots[self.is_dark] = snapshot
+        return snapshot
 
+    def load_images(self):
+        """Wait for the preloaded images and wrap them as PhotoImages."""
+        try:
+            for future in self.image_futures:
+                future.result()
+            for attr, (filename, size) in COMMON_IMAGES.items():
+                setattr(self, attr, load_photo(get_asset_path(filename), size))
+            self.get_theme_images()
         except Exception as e:
             messagebox.showerror("Image Load Error", f"Failed to load images: {e}")
             self.root.destroy()
-            return
+            return False
 
-        if self.config.get("show_splash", True):
-            self.show_splash_screen()
-        else:
-            self.initialize_main_window()
+        return True
 
     # -----------------------------------------------------------------
     # SPLASH
@@ -395,11 +798,14 @@ class OpenVPNClientApp:
             duration=2500,
             config=self.config
         )
-        splash.update()
+        splash.update_idletasks()
         self.root.after(splash.duration, self.on_splash_close, splash)
 
     def on_splash_close(self, splash):
-        save_config(self.config)
+        splash.destroy()
+        # Only write config.json if the splash checkbox actually changed it
+        if config_is_dirty():
+            save_config(self.config)
         self.initialize_main_window()
 
     # -----------------------------------------------------------------
@@ -407,6 +813,23 @@ class OpenVPNClientApp:
     # -----------------------------------------------------------------
     def get_tun_ip(self, interface='tun0'):
         """Return the IPv4 address of the TUN interface, or None if not found."""
+        if SYSTEM == "linux":
+            # One SIOCGIFADDR ioctl instead of netifaces collecting every address family
+            import fcntl
+            import socket
+            import struct
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                try:
+                    ifreq = fcntl.ioctl(
+                        sock.fileno(),
+                        SIOCGIFADDR,
+                        struct.pack("256s", interface.encode()[:15])
+                    )
+                except OSError:
+                    return None
+            return socket.inet_ntoa(ifreq[20:24])
+
+        import netifaces
         try:
             iface_info = netifaces.ifaddresses(interface)
             if netifaces.AF_INET in iface_info:
@@ -420,12 +843,18 @@ class OpenVPNClientApp:
     # MAIN WINDOW
     # -----------------------------------------------------------------
     def initialize_main_window(self):
+        if not self.load_images():
+            return
         self.root.deiconify()
+        # Closing the window goes through quit_app so a pending config save is flushed
+        self.root.protocol("WM_DELETE_WINDOW", self.quit_app)
         self.apply_theme(self.current_theme)
         self.create_widgets()
 
     def apply_theme(self, theme):
         self.current_theme = theme
+        # Cheap flag so callers don't have to compare whole theme dicts
+        self.is_dark = theme is dark_theme
 
     def create_widgets(self):
         # Menu
@@ -444,91 +873,74 @@ class OpenVPNClientApp:
         self.canvas = tk.Canvas(self.root, width=330, height=575, highlightthickness=0)
         self.canvas.pack(fill="both", expand=True)
 
-        chosen_bg = self.bg_image_dark if self.current_theme == dark_theme else self.bg_image_light
-        self.bg_item = self.canvas.create_image(0, 0, anchor="nw", image=chosen_bg)
-
-        chosen_logo = self.logo_dark if self.current_theme == dark_theme else self.logo_light
-        self.logo_item = self.canvas.create_image(20, 10, anchor="nw", image=chosen_logo)
+        assets = self.get_theme_images()
+        theme = self.current_theme
+        bg, fg = theme["bg"], theme["fg"]
+        bg_input, fg_input = theme["bg_input"], theme["fg_input"]
+        ht, hb = theme["ht"], theme["hb"]
+        self.bg_item = self.canvas.create_image(0, 0, anchor="nw", image=assets["bg"])
+        self.logo_item = self.canvas.create_image(20, 10, anchor="nw", image=assets["logo"])
 
         # THEME TOGGLE BUTTON
-        current_icon = self.dark_mode_img if self.current_theme == dark_theme else self.light_mode_img
+        current_icon = assets["toggle_icon"]
         self.toggle_button_theme = tk.Button(
             self.canvas,
             image=current_icon,
-            bg=self.current_theme["bg"],
-            fg=self.current_theme["fg"],
-            activebackground=self.current_theme["bg"],
-            activeforeground=self.current_theme["fg"],
+            bg=bg,
+            fg=fg,
+            activebackground=bg,
+            activeforeground=fg,
             bd=0,
             highlightthickness=0,
             relief="flat",
             command=self.toggle_theme
         )
-        self.toggle_button_theme.image = current_icon
-        self.canvas.create_window(285, 110, window=self.toggle_button_theme, anchor="nw")
-
-        # CONFIG PATH LABEL
-        self.config_path_var = tk.StringVar(value="None. Choose a ovpn file, Menu -> Choose ovpn file")
-        self.canvas.create_text(
-            30, 140,
-            text="Current OpenVPN config file:",
-            font=("Arial", 10),
-            fill=self.current_theme["fg"],
-            anchor="nw"
-        )
-        self.config_text_item = self.canvas.create_text(
-            30, 156,
-            text=self.config_path_var.get(),
-            font=("Arial", 9),
-            fill=self.current_theme["filetext"],
-            anchor="nw",
-            width=240
-        )
+
+        # TEXT LABELS
+        for attr, x, y, text, font, fill, anchor, width in CANVAS_TEXT_ITEMS:
+            themed = not fill.startswith("#")
+            item = self.canvas.create_text(
+                x, y,
+                text=text,
+                font=font,
+                fill=theme[fill] if themed else fill,
+                tags=("themed_fg",) if fill == "fg" else (),
+                anchor=anchor,
+                width=width
+            )
+            if attr:
+                setattr(self, attr, item)
+        # Selected .ovpn file, or None
+        self.config_path = None
+
+        # Options shared by the username and password entries
+        entry_options = {
+            "highlightthickness": ht,
+            "highlightbackground": hb,
+            "bg": bg_input,
+            "fg": fg_input,
+            "font": ("Arial", 18),
+            "width": 20,
+        }
 
         # USERNAME
-        self.canvas.create_text(
-            30, 210,
-            text="\U0001F464 Username:",
-            font=("Arial", 12),
-            fill=self.current_theme["fg"],
-            anchor="nw"
-        )
         self.username_var = tk.StringVar(value=self.config.get("saved_username", ""))
         self.username_entry = tk.Entry(
             self.canvas,
-            highlightthickness=self.current_theme.get("ht", 0),
-            highlightbackground=self.current_theme.get("hb", "orange"),
-            bg=self.current_theme["bg_input"],
-            fg=self.current_theme["fg_input"],
-            font=("Arial", 18),
             textvariable=self.username_var,
-            width=20
+            **entry_options
         )
-        self.canvas.create_window(30, 230, window=self.username_entry, anchor="nw")
 
         # PASSWORD
-        self.canvas.create_text(
-            30, 280,
-            text="\U0001F512 Password:",
-            font=("Arial", 12),
-            fill=self.current_theme["fg"],
-            anchor="nw"
-        )
         self.password_var = tk.StringVar(value=self.config.get("saved_password", ""))
 
         # Start with the password hidden by default (show="*")
         self.password_entry = tk.Entry(
             self.canvas,
-            highlightthickness=self.current_theme.get("ht", 1),
-            highlightbackground=self.current_theme.get("hb", "#fe7014"),
-            bg=self.current_theme["bg_input"],
-            fg=self.current_theme["fg_input"],
-            font=("Arial", 18),
             textvariable=self.password_var,
             show="*",   # Hide password
-            width=20
+            **entry_options
         )
-        self.canvas.create_window(30, 300, window=self.password_entry, anchor="nw")
 
         # SHOW/HIDE PASSWORD CHECKBOX
         self.show_password_var = tk.BooleanVar(value=False)
@@ -545,13 +957,12 @@ class OpenVPNClientApp:
             command=toggle_password,
             highlightthickness=0,
             border=0,
-            bg=self.current_theme["bg"],
-            fg=self.current_theme["fg"],
-            activebackground=self.current_theme["bg"],
-            activeforeground=self.current_theme["fg"],
+            bg=bg,
+            fg=fg,
+            activebackground=bg,
+            activeforeground=fg,
             selectcolor="#444444"
         )
-        self.canvas.create_window(155, 280, window=self.show_password_check, anchor="nw")
 
         # REMEMBER ME
         self.remember_me_var = tk.BooleanVar(value=self.config.get("remember_credentials", False))
@@ -563,81 +974,32 @@ class OpenVPNClientApp:
             offvalue=False,
             highlightthickness=0,
             border=0,
-            bg=self.current_theme["bg"],
-            fg=self.current_theme["fg"],
-            activebackground=self.current_theme["bg"],
-            activeforeground=self.current_theme["fg"],
+            bg=bg,
+            fg=fg,
+            activebackground=bg,
+            activeforeground=fg,
             selectcolor="#444444"
         )
-        self.canvas.create_window(30, 338, window=self.remember_me_checkbox, anchor="nw")
 
         # CONNECT BUTTON
-        current_connect_image = (
-            self.connect_button_image_dark
-            if self.current_theme == dark_theme
-            else self.connect_button_image_light
-        )
+        current_connect_image = assets["connect"]
         self.toggle_button_connect = tk.Button(
             self.canvas,
             image=current_connect_image,
             command=self.toggle_vpn,
             border=0,
             highlightthickness=0,
-            bg=self.current_theme["bg"],
-            fg=self.current_theme["fg"],
-            activebackground=self.current_theme["bg"],
-            activeforeground=self.current_theme["fg"],
+            bg=bg,
+            fg=fg,
+            activebackground=bg,
+            activeforeground=fg,
             cursor="hand2",
         )
-        self.toggle_button_connect.image = current_connect_image
-        self.canvas.create_window(128, 368, window=self.toggle_button_connect, anchor="nw")
-
-        # NETWORK TRAFFIC
-        self.canvas.create_text(
-            165, 465,
-            text="📶 Network Traffic",
-            font=("Arial", 12, "bold"),
-            fill="#8ec4e9",
-            anchor="center"
-        )
-        self.sent_label_item = self.canvas.create_text(
-            100, 487,
-            text="📤 Sent: 0.00 MB",
-            font=("Arial", 9),
-            fill=self.current_theme["fg"],
-            anchor="center"
-        )
-        self.received_label_item = self.canvas.create_text(
-            230, 487,
-            text="📥 Received: 0.00 MB",
-            font=("Arial", 9),
-            fill=self.current_theme["fg"],
-            anchor="center"
-        )
 
-        # LABEL FOR THE VPN IP
-        self.vpnip_label_item = self.canvas.create_text(
-            165, 502,
-            text=self.VPNIP,
-            font=("Arial", 10, "bold"),
-            fill="#FEEC14",
-            anchor="center"
-        )
+        # Place the widgets built above
+        for attr, x, y in CANVAS_WINDOWS:
+            self.canvas.create_window(x, y, window=getattr(self, attr), anchor="nw")
 
-        self.canvas.create_text(
-            165, 532,
-            text="VPN STATUS:",
-            font=("Arial", 10),
-            fill=self.current_theme["fg"],
-            anchor="center"
-        )
-        self.status_text_item = self.canvas.create_text(
-            165, 550,
-            text=" \U0001F513 Not Connected ",
-            font=("Arial", 12, "bold"),
-            fill="#fe7014",
-            anchor="center"
-        )
         self.cover_network_image_item = self.canvas.create_image(
             0, 420,
             anchor="nw",
@@ -652,6 +1014,11 @@ class OpenVPNClientApp:
             self.current_theme
         )
 
+        # Widgets were just built with the current theme, disconnected
+        self.applied_state = (self.get_theme_name(), self.connected)
+        self.applied_item_options = {}
+        self.applied_entry_colors = (bg_input, fg_input)
+
     # -----------------------------------------------------------------
     # MENU ACTIONS
     # -----------------------------------------------------------------
@@ -659,8 +1026,27 @@ class OpenVPNClientApp:
         self.browse_config()
 
     def quit_app(self):
+        self.flush_config()
         self.root.destroy()
 
+    def schedule_config_save(self, delay=2000):
+        """
+        Mark the config dirty and write it `delay` ms from now. Calls within
+        that window (e.g. repeated theme toggles) collapse into one write.
+        """
+        mark_config_dirty()
+        if self.config_save_id is not None:
+            self.root.after_cancel(self.config_save_id)
+        self.config_save_id = self.root.after(delay, self.flush_config)
+
+    def flush_config(self):
+        """Write a pending config change now, if there is one."""
+        if self.config_save_id is not None:
+            self.root.after_cancel(self.config_save_id)
+            self.config_save_id = None
+        if config_is_dirty():
+            save_config(self.config)
+
     def show_about(self):
         about_win = tk.Toplevel(self.root)
         about_win.title("About")
@@ -701,7 +1087,6 @@ class OpenVPNClientApp:
         ).pack(pady=5)
 
         about_win.grab_set()
-        self.root.wait_window(about_win)
 
     def show_settings(self):
         settings_win = tk.Toplevel(self.root)
@@ -739,7 +1124,7 @@ class OpenVPNClientApp:
         ).pack()
 
         self.theme_var = tk.StringVar()
-        self.theme_var.set("dark" if self.current_theme == dark_theme else "light")
+        self.theme_var.set(self.get_theme_name())
 
         tk.Radiobutton(
             settings_win,
@@ -785,7 +1170,6 @@ class OpenVPNClientApp:
         ).pack(pady=20)
 
         settings_win.grab_set()
-        self.root.wait_window(settings_win)
 
     # -----------------------------------------------------------------
     # BROWSE CONFIG
@@ -795,12 +1179,9 @@ class OpenVPNClientApp:
             title="Select OpenVPN Config File",
             filetypes=[("OpenVPN Config Files", "*.ovpn")],
         )
-        if config_file:
-            self.config_path_var.set(config_file)
-        else:
-            # If user cancels, show the hint
-            self.config_path_var.set("None. Choose a ovpn file, Menu -> Choose ovpn file")
-        self.canvas.itemconfig(self.config_text_item, text=self.config_path_var.get())
+        # If user cancels, this clears the selection and shows the hint again
+        self.config_path = config_file or None
+        self.canvas.itemconfig(self.config_text_item, text=self.config_path or NO_CONFIG_SELECTED)
 
     # -----------------------------------------------------------------
     # OPENVPN START/STOP
@@ -812,21 +1193,26 @@ class OpenVPNClientApp:
             self.stop_vpn()
 
     def start_vpn(self):
-        self.mfa_code = None
-        config_file = self.config_path_var.get()
+        self.mfa_future = Future()
+        config_file = self.config_path
         username = self.username_var.get()
         password = self.password_var.get()
 
-        # If user hasn't chosen a config file, it's basically the hint string:
-        if config_file.startswith("None. Choose"):
+        if not config_file:
             messagebox.showerror(
                 "Error",
                 "No config file selected. Please choose a .ovpn file from the Menu."
             )
             return
 
-        if not config_file or config_file == "None":
-            messagebox.showerror("Error", "Config file, username, and password are required!")
+        # Checked here so a missing file gets a clear message instead of an
+        # "OpenVPN process terminated unexpectedly" from the spawned child
+        if not os.path.isfile(config_file):
+            messagebox.showerror("Error", f"Config file not found:\n{config_file}")
+            return
+
+        if not os.path.isfile(BUNDLED_OPENVPN_PATH):
+            messagebox.showerror("Error", f"OpenVPN binary not found:\n{BUNDLED_OPENVPN_PATH}")
             return
 
         if not username or not password:
@@ -847,72 +1233,110 @@ class OpenVPNClientApp:
 
         self.toggle_button_connect.config(state="disabled")
         threading.Thread(target=self.run_vpn, args=(config_file, username, password), daemon=True).start()
-        self.monitoring = True
         self.traffic_monitor.start_monitoring()
-        self.root.after(100, self.process_queue)
 
     def run_vpn(self, config_file, username, password):
+        import pexpect
         try:
-            cmd = f"\"{BUNDLED_OPENVPN_PATH}\" --config \"{config_file}\""
-            self.vpn_process = pexpect.spawn(cmd, encoding='utf-8')
-            self.vpn_process.logfile = open("pexpect_log.txt", "w")
+            self.vpn_process = pexpect.spawn(
+                BUNDLED_OPENVPN_PATH,
+                args=["--config", config_file],
+                maxread=PEXPECT_MAXREAD,
+                searchwindowsize=PEXPECT_SEARCH_WINDOW,
+                # Wait on the pty with poll() rather than select(): no fd_set
+                # rebuilt per read and no FD_SETSIZE limit on the pty's fd number
+                use_poll=True
+            )
+            self.close_vpn_log()
+            if OPENVPN_DEBUG_LOG:
+                self.vpn_log = PexpectLog(OPENVPN_DEBUG_LOG)
+                self.vpn_process.logfile_read = self.vpn_log
 
+            # The patterns are already compiled, so use expect_list() and
+            # skip expect()'s per-call compile_pattern_list() pass
             # Basic username/password prompts
-            self.vpn_process.expect(re.compile(r"Enter Auth Username.*:", re.IGNORECASE), timeout=60)
+            self.vpn_process.expect_list([USERNAME_PROMPT_RE], timeout=AUTH_PROMPT_TIMEOUT)
             self.vpn_process.sendline(username)
 
-            self.vpn_process.expect(re.compile(r"Enter Auth Password.*:", re.IGNORECASE), timeout=60)
+            self.vpn_process.expect_list([PASSWORD_PROMPT_RE], timeout=AUTH_PROMPT_TIMEOUT)
             self.vpn_process.sendline(password)
 
-            # Check for 2FA CHALLENGE
-            mfa_prompt_pattern = re.compile(r"CHALLENGE:", re.IGNORECASE)
-            result = self.vpn_process.expect([mfa_prompt_pattern, pexpect.TIMEOUT, pexpect.EOF], timeout=30)
+            # Check for 2FA CHALLENGE. Without 2FA, OpenVPN carries on and may
+            # connect (or fail) during this wait, so look for the result too:
+            # output printed after it would push it out of the search window
+            # before the next wait. 1-3 line up with the expect_exact() below.
+            result = self.vpn_process.expect_list(
+                [MFA_CHALLENGE_RE, AUTH_FAILED_RE, CONNECTED_RE, pexpect.EOF, pexpect.TIMEOUT],
+                timeout=MFA_PROMPT_TIMEOUT
+            )
 
             if result == 0:
-                self.queue.put("SHOW_MFA")
-                while self.mfa_code is None:
-                    time.sleep(0.1)
-                if self.vpn_process and self.vpn_process.isalive():
-                    self.vpn_process.sendline(self.mfa_code.strip())
-
-            # Wait for success or fail
-            while True:
-                if not self.vpn_process.isalive():
-                    raise Exception("OpenVPN process terminated unexpectedly.")
-
+                mfa_future = self.mfa_future
+                self.root.after(0, self.show_mfa_popup, mfa_future)
                 try:
-                    line = self.vpn_process.readline().strip()
-                except pexpect.EOF:
-                    break
-                print(f"OpenVPN: {line}")
-
-                if "AUTH_FAILED" in line:
-                    self.root.after(0, lambda: messagebox.showwarning(
-                        "Error",
-                        "Authentication failed. Please check your credentials."
-                    ))
-                    raise Exception("Authentication failed.")
-
-                if "Initialization Sequence Completed" in line:
-                    self.connected = True
-                    self.root.after(0, self.update_ui_on_connect)
-                    break
+                    mfa_code = mfa_future.result(timeout=MFA_CODE_TIMEOUT)
+                except FutureTimeoutError:
+                    raise Exception("Timed out waiting for the 2FA code.")
+                except CancelledError:
+                    # The popup was closed without a code: drop this attempt
+                    return
+                if self.vpn_process and self.vpn_process.isalive():
+                    self.vpn_process.sendline(mfa_code)
+
+            if result in (0, 4):
+                # Wait for success or fail; pexpect scans its buffer for both
+                # markers at once instead of us splitting and checking every line.
+                result = 1 + self.vpn_process.expect_exact(
+                    [AUTH_FAILED_MARKER, CONNECTED_MARKER, pexpect.EOF],
+                    timeout=CONNECT_TIMEOUT
+                )
+
+            if result == 1:
+                self.root.after(0, lambda: messagebox.showwarning(
+                    "Error",
+                    "Authentication failed. Please check your credentials."
+                ))
+                return
+
+            if result == 3:
+                raise Exception("OpenVPN process terminated unexpectedly.")
+
+            self.connected = True
+            # Look up the TUN IP here on the worker so the Tk thread only
+            # has to draw it
+            self.root.after(0, self.update_ui_on_connect, self.get_tun_ip("tun0"))
         except Exception as e:
-            print(f"VPN Error: {e}")
-            self.root.after(0, lambda: messagebox.showerror("Error", f"VPN Error: {e}"))
-            self.root.after(0, self.update_ui_on_disconnect)
+            # `e` is unbound once the except block ends, so format it now
+            error_message = f"VPN Error: {e}"
+            print(error_message)
+            self.root.after(0, lambda: messagebox.showerror("Error", error_message))
         finally:
+            if not self.connected:
+                self.abort_vpn()
             self.reset_buttons()
 
-    def update_ui_on_connect(self):
+    def abort_vpn(self):
+        """
+        Clean up after a connection attempt that didn't connect (auth failure,
+        OpenVPN exiting, an error, the 2FA prompt closed or timed out). Runs on
+        the run_vpn worker; the UI part is handed to the Tk thread.
+        """
+        if self.mfa_future:
+            # Closes the 2FA popup if it is (about to be) shown
+            self.mfa_future.cancel()
+        if self.vpn_process:
+            self.vpn_process.close(force=True)
+            self.vpn_process = None
+        # Write out the (buffered) debug log of the failed attempt now
+        self.close_vpn_log()
+        self.root.after(0, self.traffic_monitor.stop_monitoring)
+        self.root.after(0, self.update_ui_on_disconnect)
+
+    def update_ui_on_connect(self, tun_ip):
         messagebox.showinfo(message="Successfully connected.")
-        if self.current_theme == dark_theme:
-            new_image = self.disconnect_button_image_dark
-        else:
-            new_image = self.disconnect_button_image_light
+        new_image = self.get_theme_images()["disconnect"]
 
         self.toggle_button_connect.config(image=new_image)
-        self.toggle_button_connect.image = new_image
         self.canvas.itemconfig(
             self.status_text_item,
             text=" \U0001F512 - CONNECTED - ",
@@ -920,8 +1344,7 @@ class OpenVPNClientApp:
             fill=self.current_theme["highlight_text"],
         )
 
-        # Fetch the TUN IP now that we're connected
-        tun_ip = self.get_tun_ip("tun0")
+        # TUN IP fetched by run_vpn() once connected
         if tun_ip:
             self.VPNIP = f"VPN IP: {tun_ip}"
         else:
@@ -937,29 +1360,36 @@ class OpenVPNClientApp:
         )
 
     def stop_vpn(self):
+        import pexpect
+        import signal
         if self.vpn_process and self.vpn_process.isalive():
+            # SIGTERM makes OpenVPN shut down cleanly. Keep reading its output
+            # until EOF: nothing reads the pty once connected, and with a full
+            # pty OpenVPN would block writing its shutdown messages.
             try:
-                self.vpn_process.sendcontrol('c')
-                self.vpn_process.expect(pexpect.EOF, timeout=10)
+                self.vpn_process.kill(signal.SIGTERM)
+                self.vpn_process.expect_list([pexpect.EOF], timeout=STOP_TIMEOUT)
             except pexpect.TIMEOUT:
                 self.vpn_process.terminate(force=True)
 
+        if self.vpn_process:
             self.vpn_process.close(force=True)
             self.vpn_process = None
 
+        self.close_vpn_log()
         self.connected = False
-        self.monitoring = False
         self.traffic_monitor.stop_monitoring()
         self.update_ui_on_disconnect()
 
+    def close_vpn_log(self):
+        if self.vpn_log:
+            self.vpn_log.close()
+            self.vpn_log = None
+
     def update_ui_on_disconnect(self):
-        if self.current_theme == dark_theme:
-            new_image = self.connect_button_image_dark
-        else:
-            new_image = self.connect_button_image_light
+        new_image = self.get_theme_images()["connect"]
 
         self.toggle_button_connect.config(image=new_image)
-        self.toggle_button_connect.image = new_image
         self.canvas.itemconfig(self.status_text_item, text=" - DISCONNECTED -", fill="red")
 
         # Clear the VPN IP on disconnect
@@ -972,44 +1402,51 @@ class OpenVPNClientApp:
     # -----------------------------------------------------------------
     # MFA POPUP
     # -----------------------------------------------------------------
-    def process_queue(self):
-        try:
-            while not self.queue.empty():
-                message = self.queue.get_nowait()
-                if message == "SHOW_MFA":
-                    self.show_mfa_popup()
-        except Exception as e:
-            print(f"Queue processing error: {e}")
-        finally:
-            if self.monitoring:
-                self.root.after(100, self.process_queue)
+    def show_mfa_popup(self, mfa_future):
+        """
+        Ask for the 2FA code and hand it to run_vpn through `mfa_future`.
+        Returns right away; the popup is modal through grab_set(). Closing
+        it cancels the future, which aborts the connection attempt; the popup
+        closes itself when run_vpn gives up on the attempt (e.g. on timeout).
+        """
+        if mfa_future.done():
+            # run_vpn already gave up before the popup got shown
+            return
 
-    def show_mfa_popup(self):
         def submit_mfa():
             code = mfa_code_var.get().strip()
             if code:
-                self.mfa_code = code
+                if not mfa_future.done():
+                    mfa_future.set_result(code)
                 mfa_window.destroy()
             else:
                 messagebox.showerror("Error", "2FA code cannot be empty!")
 
+        def cancel_mfa():
+            mfa_future.cancel()
+            mfa_window.destroy()
+
+        def close_mfa():
+            if mfa_window.winfo_exists():
+                mfa_window.destroy()
+
         mfa_window = tk.Toplevel(self.root)
         mfa_window.title("Your 2FA Code")
         mfa_window.configure(bg=self.current_theme["bg"])
         mfa_window.geometry("300x340")
         mfa_window.resizable(False, False)
+        mfa_window.protocol("WM_DELETE_WINDOW", cancel_mfa)
+        mfa_future.add_done_callback(lambda _: self.root.after(0, close_mfa))
 
         try:
-            second_logo_image = (
-                Image.open(get_asset_path("2fa.png"))
-                .convert("RGBA")
-                .resize((200, 100), Image.Resampling.LANCZOS)
-            )
-            self.second_logo = ImageTk.PhotoImage(second_logo_image)
+            self.second_logo = load_photo(get_asset_path("2fa.png"), (200, 100))
             tk.Label(mfa_window, image=self.second_logo, bg=self.current_theme["bg"]).pack(pady=10)
         except Exception as e:
             messagebox.showerror("Image Load Error", f"Failed to load 2FA logo: {e}")
             mfa_window.destroy()
+            # Don't leave run_vpn waiting for a code that can't be entered
+            if not mfa_future.done():
+                mfa_future.set_exception(Exception("The 2FA prompt could not be shown."))
             return
 
         tk.Label(
@@ -1043,89 +1480,76 @@ class OpenVPNClientApp:
         ).pack(pady=10)
 
         mfa_window.grab_set()
-        self.root.wait_window(mfa_window)
 
     # -----------------------------------------------------------------
     # THEME TOGGLE
     # -----------------------------------------------------------------
     def toggle_theme(self):
-        if self.current_theme == dark_theme:
+        if self.is_dark:
             self.apply_theme(light_theme)
             self.config["theme"] = "light"
         else:
             self.apply_theme(dark_theme)
             self.config["theme"] = "dark"
 
-        save_config(self.config)
+        self.schedule_config_save()
         self.apply_theme_to_widgets()
 
-    def apply_theme_to_widgets(self):
-        if self.current_theme == dark_theme:
-            self.canvas.itemconfig(self.bg_item, image=self.bg_image_dark)
-        else:
-            self.canvas.itemconfig(self.bg_item, image=self.bg_image_light)
-
-        # Toggle button icon
-        if self.current_theme == dark_theme:
-            self.toggle_button_theme.config(
-                image=self.dark_mode_img,
-                bg=self.current_theme["bg"],
-                fg=self.current_theme["fg"],
-                activebackground=self.current_theme["bg"],
-                activeforeground=self.current_theme["fg"]
-            )
-            self.toggle_button_theme.image = self.dark_mode_img
-        else:
-            self.toggle_button_theme.config(
-                image=self.light_mode_img,
-                bg=self.current_theme["bg"],
-                fg=self.current_theme["fg"],
-                activebackground=self.current_theme["bg"],
-                activeforeground=self.current_theme["fg"]
-            )
-            self.toggle_button_theme.image = self.light_mode_img
-
-        # File text, status text, etc.
-        self.canvas.itemconfig(self.config_text_item, fill=self.current_theme["filetext"])
-        self.canvas.itemconfig(self.sent_label_item, fill=self.current_theme["fg"])
-        self.canvas.itemconfig(self.received_label_item, fill=self.current_theme["fg"])
-
-        # Update "VPN STATUS" text color
-        if self.connected:
-            if self.current_theme == dark_theme:
-                new_image = self.disconnect_button_image_dark
-                self.canvas.itemconfig(self.status_text_item, text=" \U0001F512 Connected ", fill="#71e900")
-            else:
-                new_image = self.disconnect_button_image_light
-                self.canvas.itemconfig(self.status_text_item, text=" \U0001F512 Connected ", fill="#71e900")
-        else:
-            if self.current_theme == dark_theme:
-                new_image = self.connect_button_image_dark
-                self.canvas.itemconfig(self.status_text_item, text=" \U0001F513 Not Connected ", fill="orange")
-            else:
-                new_image = self.connect_button_image_light
-                self.canvas.itemconfig(self.status_text_item, text=" \U0001F513 Not Connected ", fill="orange")
-
-        self.toggle_button_connect.config(
-            image=new_image,
-            bg=self.current_theme["bg"],
-            fg=self.current_theme["fg"],
-            activebackground=self.current_theme["bg"],
-            activeforeground=self.current_theme["fg"]
-        )
-        self.toggle_button_connect.image = new_image
+    def itemconfig_changed(self, item, **options):
+        """
+        Canvas itemconfig that only sends the options whose value differs
+        from what was last applied through this method. Only use it for
+        options that are not also set elsewhere (i.e. theme colors/images).
+        """
+        changed = {
+            option: value for option, value in options.items()
+            if self.applied_item_options.get((item, option)) != value
+        }
+        if changed:
+            self.canvas.itemconfig(item, **changed)
+            for option, value in changed.items():
+                self.applied_item_options[(item, option)] = value
 
-        self.username_entry.config(bg=self.current_theme["bg_input"], fg=self.current_theme["fg_input"])
-        self.password_entry.config(bg=self.current_theme["bg_input"], fg=self.current_theme["fg_input"])
+    def apply_theme_to_widgets(self):
+        # Nothing to do if neither the theme nor the connection state changed
+        # (e.g. Settings saved with the theme that is already shown)
+        previous_state = self.applied_state
+        state = (self.get_theme_name(), self.connected)
+        if state == previous_state:
+            return
+        self.applied_state = state
+
+        # Connect button image and "VPN STATUS" text (status colors are the same in both themes)
+        image, text, fill = self.get_connection_view()
+        self.canvas.itemconfig(self.status_text_item, text=text, fill=fill)
+        if state[0] == previous_state[0]:
+            # Only the connection state changed: the colors are already right
+            self.toggle_button_connect.config(image=image)
+            return
 
+        widget_options, item_options, entry_colors = self.get_theme_snapshot()
+        for widget, options in widget_options:
+            widget.config(**options)
+        # The connect button's image depends on the connection state as well
+        self.toggle_button_connect.config(image=image, **self.get_button_colors())
+        for item, options in item_options:
+            self.itemconfig_changed(item, **options)
+
+        # Entry colors, skipped when both themes happen to use the same ones
+        if entry_colors != self.applied_entry_colors:
+            self.applied_entry_colors = entry_colors
+            bg_input, fg_input = entry_colors
+            self.username_entry.config(bg=bg_input, fg=fg_input)
+            self.password_entry.config(bg=bg_input, fg=fg_input)
 
 # ---------------------------------------------------------------------
 # MAIN
 # ---------------------------------------------------------------------
 if __name__ == "__main__":
     root = tk.Tk()
-    app = OpenVPNClientApp(root)
+    # Window properties first, so the main window is laid out at its final size once
     root.title("OpenVPN - Linux Client (Bundled)")
     root.geometry("330x575")
     root.resizable(False, False)
+    app = OpenVPNClientApp(root)
     root.mainloop()